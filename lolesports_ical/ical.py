@@ -1,103 +1,134 @@
 from __future__ import annotations
 
+import io
 from datetime import datetime, timedelta, timezone
+from operator import attrgetter
 from typing import Iterable
 
 from .models import Match
 from .util import ensure_tzaware_utc
 
 
+_ICS_ESCAPE_TABLE = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+
+
 def _ics_escape(text: str) -> str:
-    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+    return text.translate(_ICS_ESCAPE_TABLE)
 
 
 def _fold_ics_line(line: str, limit: int = 75) -> str:
     # RFC5545 line folding: CRLF + single space continuation.
-    if len(line) <= limit:
+    # The limit is in octets, so measure the UTF-8 encoding and never split a code point.
+    if len(line) <= limit and line.isascii():
+        return line
+    data = line.encode("utf-8")
+    if len(data) <= limit:
         return line
     out = []
-    while len(line) > limit:
-        out.append(line[:limit])
-        line = " " + line[limit:]
-    out.append(line)
-    return "\r\n".join(out)
+    start = 0
+    width = limit
+    while len(data) - start > width:
+        end = start + width
+        while data[end] & 0xC0 == 0x80:  # UTF-8 continuation byte
+            end -= 1
+        out.append(data[start:end].decode("utf-8"))
+        start = end
+        width = limit - 1  # continuation lines spend one octet on the leading space
+    out.append(data[start:].decode("utf-8"))
+    return "\r\n ".join(out)
 
 
 def _dt_to_ics_utc(dt: datetime) -> str:
-    dt_utc = ensure_tzaware_utc(dt).astimezone(timezone.utc).replace(microsecond=0)
-    return dt_utc.strftime("%Y%m%dT%H%M%SZ")
-
-
-def _estimate_match_duration(best_of: str | None) -> timedelta:
-    """Estimate match duration based on best-of format."""
-    if best_of == "Bo5":
-        return timedelta(hours=4)
-    elif best_of == "Bo3":
-        return timedelta(hours=2, minutes=30)
-    else:  # Bo1 or unknown
-        return timedelta(hours=1, minutes=30)
+    # Formatted by hand: strftime is comparatively slow and this runs 3x per event.
+    u = ensure_tzaware_utc(dt)
+    return f"{u.year:04d}{u.month:02d}{u.day:02d}T{u.hour:02d}{u.minute:02d}{u.second:02d}Z"
+
+
+# Estimated match duration by best-of format; Bo1 and unknown formats use the default.
+_DURATION_BY_BEST_OF = {
+    "Bo5": timedelta(hours=4),
+    "Bo3": timedelta(hours=2, minutes=30),
+}
+_DEFAULT_DURATION = timedelta(hours=1, minutes=30)
+
+
+# One VEVENT with all static pieces baked in; `uid`, `summary` and `description`
+# are complete (folded) property lines, `url_line` is empty or ends with CRLF.
+_EVENT_TEMPLATE = (
+    "BEGIN:VEVENT\r\n"
+    "{uid}\r\n"
+    "{stamp}\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtend}\r\n"
+    "{summary}\r\n"
+    "{description}\r\n"
+    "{url_line}"
+    "END:VEVENT\r\n"
+)
 
 
 def render_ical(matches: Iterable[Match], *, prodid: str = "-//lolesports-ical//EN") -> str:
-    now = datetime.now(timezone.utc)
-    lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "CALSCALE:GREGORIAN",
-        "METHOD:PUBLISH",
-        f"PRODID:{_ics_escape(prodid)}",
-        "X-WR-CALNAME:LoL Esports",
-    ]
-
-    for m in sorted(matches, key=lambda x: x.match_start_utc):
+    stamp_line = f"DTSTAMP:{_dt_to_ics_utc(datetime.now(timezone.utc))}"
+    buf = io.StringIO()
+    buf.write(
+        "BEGIN:VCALENDAR\r\n"
+        "VERSION:2.0\r\n"
+        "CALSCALE:GREGORIAN\r\n"
+        "METHOD:PUBLISH\r\n"
+        f"PRODID:{_ics_escape(prodid)}\r\n"
+        "X-WR-CALNAME:LoL Esports\r\n"
+    )
+
+    for m in sorted(matches, key=attrgetter("match_start_utc")):
         # Use team codes for summary (short names), fall back to full names
         t1_display = m.team1_code or m.team1
         t2_display = m.team2_code or m.team2
 
+        completed = m.state == "completed"
+        has_score = m.team1_score is not None and m.team2_score is not None
+
         # Build summary with score if match is completed
-        if m.state == "completed" and m.team1_score is not None and m.team2_score is not None:
+        if completed and has_score:
             summary = f"[{m.league_name}] {t1_display} {m.team1_score}-{m.team2_score} {t2_display}"
         else:
             summary = f"[{m.league_name}] {t1_display} vs {t2_display}"
 
-        # Build description with full team names
-        desc_parts = [f"League: {m.league_name}"]
-        desc_parts.append(f"Match: {m.team1} vs {m.team2}")
-        if m.stage:
-            desc_parts.append(f"Stage: {m.stage}")
-        if m.best_of:
-            desc_parts.append(f"Format: {m.best_of}")
-
-        # Add result info for completed matches
-        if m.state == "completed":
-            if m.team1_score is not None and m.team2_score is not None:
-                desc_parts.append(f"Result: {m.team1} {m.team1_score} - {m.team2_score} {m.team2}")
-            if m.winner:
-                desc_parts.append(f"Winner: {m.winner}")
-        elif m.state == "inProgress":
-            desc_parts.append("Status: LIVE")
-
-        description = "\n".join(desc_parts)
+        # Build description with full team names, plus result info for completed matches
+        description = "\n".join(
+            part
+            for part in (
+                f"League: {m.league_name}",
+                f"Match: {m.team1} vs {m.team2}",
+                f"Stage: {m.stage}" if m.stage else None,
+                f"Format: {m.best_of}" if m.best_of else None,
+                (
+                    f"Result: {m.team1} {m.team1_score} - {m.team2_score} {m.team2}"
+                    if completed and has_score
+                    else None
+                ),
+                f"Winner: {m.winner}" if completed and m.winner else None,
+                "Status: LIVE" if m.state == "inProgress" else None,
+            )
+            if part is not None
+        )
 
         # Calculate end time based on best-of format
-        match_duration = _estimate_match_duration(m.best_of)
-        match_end_utc = m.match_start_utc + match_duration
-
-        event_lines = [
-            "BEGIN:VEVENT",
-            f"UID:{_ics_escape(m.stable_uid)}",
-            f"DTSTAMP:{_dt_to_ics_utc(now)}",
-            f"DTSTART:{_dt_to_ics_utc(m.match_start_utc)}",
-            f"DTEND:{_dt_to_ics_utc(match_end_utc)}",
-            f"SUMMARY:{_ics_escape(summary)}",
-            f"DESCRIPTION:{_ics_escape(description)}",
-        ]
-        if m.match_url:
-            event_lines.append(f"URL:{m.match_url}")
-        event_lines.append("END:VEVENT")
-
-        for l in event_lines:
-            lines.append(_fold_ics_line(l))
-
-    lines.append("END:VCALENDAR")
-    return "\r\n".join(lines) + "\r\n"
+        match_end_utc = m.match_start_utc + _DURATION_BY_BEST_OF.get(m.best_of, _DEFAULT_DURATION)
+
+        # DTSTAMP/DTSTART/DTEND are fixed-width ASCII well under 75 octets,
+        # so only the free-form properties go through the folder.
+        url_line = _fold_ics_line(f"URL:{m.match_url}") + "\r\n" if m.match_url else ""
+        buf.write(
+            _EVENT_TEMPLATE.format(
+                uid=_fold_ics_line(f"UID:{_ics_escape(m.stable_uid)}"),
+                stamp=stamp_line,
+                dtstart=_dt_to_ics_utc(m.match_start_utc),
+                dtend=_dt_to_ics_utc(match_end_utc),
+                summary=_fold_ics_line(f"SUMMARY:{_ics_escape(summary)}"),
+                description=_fold_ics_line(f"DESCRIPTION:{_ics_escape(description)}"),
+                url_line=url_line,
+            )
+        )
+
+    buf.write("END:VCALENDAR\r\n")
+    return buf.getvalue()
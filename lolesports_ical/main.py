@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import argparse
-import json
+import dataclasses
+import heapq
+import re
+import sys
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 from .ical import render_ical
 from .models import Match
 from .scrape import LEAGUE_SLUGS_DEFAULT, ScrapeConfig, scrape_matches
-from .util import DiskCache, Fetcher, RateLimiter, RetryConfig
-from zoneinfo import ZoneInfo
+from .util import (
+    DiskCache,
+    Fetcher,
+    RateLimiter,
+    RetryConfig,
+    json_dumps_indented,
+    json_loads,
+)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -22,7 +32,7 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument(
         "--tz",
         default="Europe/Berlin",
-        help="Local timezone for match_start_local (default: Europe/Berlin)",
+        help="IANA timezone name; only validated, feed times are UTC (default: Europe/Berlin)",
     )
     p.add_argument(
         "--days", type=int, default=30, help="How many days ahead to include (default: 30)"
@@ -49,6 +59,7 @@ def match_to_dict(m: Match) -> Dict[str, Any]:
         "league_name": m.league_name,
         "match_id": m.match_id,
         "match_start_utc": m.match_start_utc.isoformat(),
+        "match_start_utc_ts": int(m.match_start_utc.timestamp()),
         "best_of": m.best_of,
         "team1": m.team1,
         "team2": m.team2,
@@ -64,20 +75,24 @@ def match_to_dict(m: Match) -> Dict[str, Any]:
     }
 
 
-def dict_to_match(d: Dict[str, Any], tz_name: str) -> Match:
+def dict_to_match(d: Dict[str, Any]) -> Match:
     """Convert a dict back to a Match object."""
-    tz = ZoneInfo(tz_name)
-    start_utc = datetime.fromisoformat(d["match_start_utc"])
-    if start_utc.tzinfo is None:
-        start_utc = start_utc.replace(tzinfo=timezone.utc)
-    start_local = start_utc.astimezone(tz)
+    ts = d.get("match_start_utc_ts")
+    iso = d.get("match_start_utc")
+    if isinstance(ts, int) and not (isinstance(iso, str) and "." in iso):
+        # Epoch seconds skip ISO parsing; the ISO field is kept for older history files
+        # and is authoritative for sub-second starts, which whole seconds can't carry.
+        start_utc = datetime.fromtimestamp(ts, tz=timezone.utc)
+    else:
+        start_utc = datetime.fromisoformat(iso)
+        if start_utc.tzinfo is None:
+            start_utc = start_utc.replace(tzinfo=timezone.utc)
 
     return Match(
         league_slug=d["league_slug"],
         league_name=d["league_name"],
         match_id=d.get("match_id"),
         match_start_utc=start_utc,
-        match_start_local=start_local,
         best_of=d.get("best_of"),
         team1=d["team1"],
         team2=d["team2"],
@@ -93,35 +108,40 @@ def dict_to_match(d: Dict[str, Any], tz_name: str) -> Match:
     )
 
 
+# Common LoL Esports match URLs we emit:
+# - https://lolesports.com/live/<league>/<match_id>
+# - https://lolesports.com/match/<match_id>
+# - https://lolesports.com/matches/<match_id>
+_MATCH_ID_RE = re.compile(r"/(?:live/[^/]+|match|matches)/(\d+)")
+
+
 def extract_match_id_from_url(url: str | None) -> str | None:
     if not url:
         return None
-    # Common LoL Esports match URLs we emit:
-    # - https://lolesports.com/live/<league>/<match_id>
-    # - https://lolesports.com/match/<match_id>
-    # - https://lolesports.com/matches/<match_id>
-    for pat in (r"/live/[^/]+/(\d+)", r"/match/(\d+)", r"/matches/(\d+)"):
-        m = __import__("re").search(pat, url)
-        if m:
-            return m.group(1)
-    return None
-
-
-def canonical_key_for_dict(d: Dict[str, Any]) -> Tuple[str, str, str]:
+    m = _MATCH_ID_RE.search(url)
+    return m.group(1) if m else None
+
+
+def _canonical_key(kind: str, league_slug: str, ident: str) -> str:
+    # Single interned string: cheaper to hash and compare than a 3-tuple of strings.
+    return sys.intern(f"{kind}\x00{league_slug}\x00{ident}")
+
+
+def canonical_key_for_dict(d: Dict[str, Any]) -> str:
     league_slug = str(d.get("league_slug") or "")
     match_id = d.get("match_id") or extract_match_id_from_url(d.get("match_url"))
     if match_id:
-        return ("id", league_slug, str(match_id))
+        return _canonical_key("id", league_slug, str(match_id))
     start = str(d.get("match_start_utc") or "")
     team1 = str(d.get("team1") or "").strip()
     team2 = str(d.get("team2") or "").strip()
-    return ("fallback", league_slug, "|".join([start, team1, team2]))
+    return _canonical_key("fallback", league_slug, "|".join([start, team1, team2]))
 
 
-def canonical_key_for_match(m: Match) -> Tuple[str, str, str]:
+def canonical_key_for_match(m: Match) -> str:
     if m.match_id:
-        return ("id", m.league_slug, str(m.match_id))
-    return (
+        return _canonical_key("id", m.league_slug, str(m.match_id))
+    return _canonical_key(
         "fallback",
         m.league_slug,
         "|".join([m.match_start_utc.isoformat(), m.team1.strip(), m.team2.strip()]),
@@ -142,28 +162,52 @@ def history_rank(d: Dict[str, Any]) -> Tuple[int, int, int, int, int]:
 
 
 def with_uid(m: Match, uid: str) -> Match:
-    return Match(
-        league_slug=m.league_slug,
-        league_name=m.league_name,
-        match_id=m.match_id,
-        match_start_utc=m.match_start_utc,
-        match_start_local=m.match_start_local,
-        best_of=m.best_of,
-        team1=m.team1,
-        team2=m.team2,
-        team1_code=m.team1_code,
-        team2_code=m.team2_code,
-        stage=m.stage,
-        match_url=m.match_url,
-        stable_uid=uid,
-        state=m.state,
-        team1_score=m.team1_score,
-        team2_score=m.team2_score,
-        winner=m.winner,
-    )
+    if m.stable_uid == uid:
+        return m
+    return dataclasses.replace(m, stable_uid=uid)
+
+
+# Parsed history index per file, reused while the file's (mtime_ns, size) is unchanged.
+# A rewrite of the same size within the filesystem's mtime granularity looks unchanged,
+# so writers in this module drop the file's entry instead of trusting the stat key.
+_HISTORY_CACHE: Dict[str, Tuple[int, int, Dict[str, Dict[str, Any]]]] = {}
+
+
+def index_history_entries(entries: Iterable[Any]) -> Dict[str, Dict[str, Any]]:
+    """Index history dicts by canonical key, keeping the best-ranked entry per match."""
+    best_by_canonical: Dict[str, Dict[str, Any]] = {}
+    for d in entries:
+        if not isinstance(d, dict):
+            continue
+        key = canonical_key_for_dict(d)
+        prev = best_by_canonical.get(key)
+        if prev is None or history_rank(d) > history_rank(prev):
+            best_by_canonical[key] = d
+    return best_by_canonical
+
+
+def load_history_index(history_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the history file as a canonical-key index (empty if missing or corrupt).
+
+    The returned dicts may be shared with later calls and must not be mutated.
+    """
+    try:
+        st = history_path.stat()
+    except FileNotFoundError:
+        return {}
+    cache_key = str(history_path.resolve())
+    cached = _HISTORY_CACHE.get(cache_key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    try:
+        index = index_history_entries(json_loads(history_path.read_bytes()).get("matches", []))
+    except Exception:
+        return {}  # Start fresh if history is corrupted
+    _HISTORY_CACHE[cache_key] = (st.st_mtime_ns, st.st_size, index)
+    return index
 
 
-def merge_with_history(fresh_matches: List[Match], history_path: Path, tz_name: str) -> List[Match]:
+def merge_with_history(fresh_matches: List[Match], history_path: Path) -> List[Match]:
     """
     Merge freshly scraped matches with historical data.
 
@@ -171,36 +215,23 @@ def merge_with_history(fresh_matches: List[Match], history_path: Path, tz_name:
     - Historical completed matches are preserved even if not in fresh data
     - History file is updated with the merged result
     """
-    # Load existing history
-    history_best_by_canonical: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
-    if history_path.exists():
-        try:
-            history_data = json.loads(history_path.read_text(encoding="utf-8"))
-            for d in history_data.get("matches", []):
-                if not isinstance(d, dict):
-                    continue
-                key = canonical_key_for_dict(d)
-                prev = history_best_by_canonical.get(key)
-                if prev is None or history_rank(d) > history_rank(prev):
-                    history_best_by_canonical[key] = d
-        except Exception:
-            pass  # Start fresh if history is corrupted
+    history_best_by_canonical = load_history_index(history_path)
 
     # Merge by canonical key so the same match can't exist twice.
-    merged_by_canonical: Dict[Tuple[str, str, str], Match] = {}
-
-    # First, add all fresh matches (but preserve previously-seen UID for the same match).
+    # Fresh matches first (but preserve previously-seen UID for the same match).
+    fresh_by_canonical: Dict[str, Match] = {}
     for m in fresh_matches:
         key = canonical_key_for_match(m)
         hist = history_best_by_canonical.get(key)
         if hist and hist.get("stable_uid"):
-            merged_by_canonical[key] = with_uid(m, str(hist["stable_uid"]))
+            fresh_by_canonical[key] = with_uid(m, str(hist["stable_uid"]))
         else:
-            merged_by_canonical[key] = m
+            fresh_by_canonical[key] = m
 
-    # Then, add historical matches that aren't in fresh data
+    # Then, historical matches that aren't in fresh data
+    history_only: List[Match] = []
     for key, d in history_best_by_canonical.items():
-        if key in merged_by_canonical:
+        if key in fresh_by_canonical:
             continue
         try:
             # Backfill match_id if it can be inferred from URL.
@@ -209,18 +240,30 @@ def merge_with_history(fresh_matches: List[Match], history_path: Path, tz_name:
                 if mid:
                     d = dict(d)
                     d["match_id"] = mid
-            merged_by_canonical[key] = dict_to_match(d, tz_name)
+            history_only.append(dict_to_match(d))
         except Exception:
             pass  # Skip malformed entries
 
+    # Sort by date for readability. The history file is written sorted, so sorting
+    # `history_only` is near-linear and a single merge pass yields the final order.
+    # The returned matches and their serialized form are built in that same pass.
+    by_start = attrgetter("match_start_utc")
+    merged: List[Match] = []
+    merged_dicts: List[Dict[str, Any]] = []
+    for m in heapq.merge(
+        sorted(fresh_by_canonical.values(), key=by_start),
+        sorted(history_only, key=by_start),
+        key=by_start,
+    ):
+        merged.append(m)
+        merged_dicts.append(match_to_dict(m))
+
     # Save updated history
-    all_matches_dicts = [match_to_dict(m) for m in merged_by_canonical.values()]
-    # Sort by date for readability
-    all_matches_dicts.sort(key=lambda x: x.get("match_start_utc", ""))
     history_path.parent.mkdir(parents=True, exist_ok=True)
-    history_path.write_text(json.dumps({"matches": all_matches_dicts}, indent=2), encoding="utf-8")
+    history_path.write_bytes(json_dumps_indented({"matches": merged_dicts}))
+    _HISTORY_CACHE.pop(str(history_path.resolve()), None)
 
-    return list(merged_by_canonical.values())
+    return merged
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -244,11 +287,12 @@ def main(argv: list[str] | None = None) -> int:
     # Merge with history if provided
     if args.history:
         history_path = Path(args.history)
-        matches = merge_with_history(matches, history_path, tz_name=args.tz)
+        matches = merge_with_history(matches, history_path)
 
     ics = render_ical(matches)
     out_path = Path(args.out)
-    out_path.write_text(ics, encoding="utf-8")
+    # Binary write: the feed already uses CRLF and must not get newline translation.
+    out_path.write_bytes(ics.encode("utf-8"))
 
     leagues_found = {m.league_slug for m in matches}
     print(f"Fetched {len(matches)} matches across {len(leagues_found)} leagues; wrote {out_path}")
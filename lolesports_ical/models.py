@@ -11,7 +11,6 @@ class Match:
     league_name: str
     match_id: Optional[str]  # Stable match identifier when available
     match_start_utc: datetime
-    match_start_local: datetime
     best_of: Optional[str]
     team1: str
     team2: str
@@ -2,15 +2,16 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional
+from datetime import timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
 import re
 
-from bs4 import BeautifulSoup
-from zoneinfo import ZoneInfo
+from lxml import etree
+from lxml import html as lxml_html
 
 from .models import Match
-from .util import Fetcher, isoformat_z, stable_uid
+from .util import Fetcher, get_zone, isoformat_z, json_loads, parse_iso_datetime, stable_uid
 
 
 LEAGUE_SLUGS_DEFAULT = [
@@ -25,7 +26,67 @@ LEAGUE_SLUGS_DEFAULT = [
 ]
 
 
-@dataclass(frozen=True)
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+# Descendants carrying the `team` class (the `.team` CSS selector).
+_TEAM_XPATH = etree.XPath(
+    "descendant::*[contains(concat(' ', normalize-space(@class), ' '), ' team ')]"
+)
+
+
+# Stage chips: a span/div whose whole text (case-insensitively) is one of these names.
+_STAGE_NAMES = frozenset(
+    ("playoffs", "swiss", "groups", "group stage", "final", "semifinal", "quarterfinal")
+)
+# Only short elements can be chips, so libxml2 drops card-sized wrappers before their
+# text is collected in Python. The limit counts non-space characters (`&nbsp;` counts as
+# space); elements holding script/style are always kept, as that text is not the chip's.
+_CHIP_XPATH = etree.XPath(
+    "(descendant::span | descendant::div)[string-length(translate(., ' \t\r\n\u00a0', '')) <= %d"
+    " or descendant::script or descendant::style]"
+    % max(len(name.replace(" ", "")) for name in _STAGE_NAMES)
+)
+
+
+# Ancestor tags that may hold a match card, and the tokens separating two team names.
+_CONTAINER_TAGS = frozenset(("article", "div", "li", "section"))
+_VS_TOKENS = frozenset(("vs", "v"))
+
+
+# A quoted string literal (kept as-is) or a bare `undefined` token (replaced by null).
+_JS_STRING_OR_UNDEFINED_RE = re.compile(
+    r'("[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\')|\bundefined\b', re.DOTALL
+)
+
+
+def _undefined_to_null(m: re.Match[str]) -> str:
+    return m.group(1) or "null"
+
+
+# Whitespace JSON allows around a value; raw_decode does not skip it by itself.
+_JSON_WS_RE = re.compile(r"[ \t\n\r]*")
+
+
+# Text nodes under an element, minus <script>/<style> bodies (BeautifulSoup's get_text
+# skipped those too; itertext() would not). Tails of such elements are still included.
+_TEXT_XPATH = etree.XPath("descendant::text()[not(parent::script or parent::style)]")
+
+
+def _stripped_strings(el: Any) -> List[str]:
+    """Non-empty, stripped text nodes under `el` in document order."""
+    return [t for t in (s.strip() for s in _TEXT_XPATH(el)) if t]
+
+
+def _text(el: Any, sep: str = " ") -> str:
+    return sep.join(_stripped_strings(el))
+
+
+# Parsed matches per (page digest, leagues, page URL); oldest entry evicted first.
+_PARSE_CACHE: Dict[Tuple[bytes, Tuple[str, ...], str], List[Match]] = {}
+_PARSE_CACHE_MAX = 16
+
+
+@dataclass(frozen=True, slots=True)
 class ScrapeConfig:
     tz: str = "Europe/Berlin"
     days: int = 30
@@ -44,47 +105,67 @@ class HtmlScraper:
         tz_name: str,
         page_url: str,
     ) -> List[Match]:
-        tz = ZoneInfo(tz_name)
-        soup = BeautifulSoup(html, "lxml")
+        get_zone(tz_name)  # tz_name is only validated (unknown zones fail fast); feed times are UTC
 
-        # 1) Prefer structured SSR data when available.
+        # 1) Prefer structured SSR data when available; the DOM is only built without it.
         apollo_matches = HtmlScraper._parse_from_apollo_ssr(
-            html, league_slugs=league_slugs, tz=tz, page_url=page_url
+            html, league_slugs=league_slugs, page_url=page_url
         )
         if apollo_matches:
             return apollo_matches
 
-        # Heuristic: Next.js often embeds JSON in a script tag.
-        league_name_by_slug: Dict[str, str] = {s: s for s in league_slugs}
-        next_data = soup.find("script", id="__NEXT_DATA__")
-        if next_data and next_data.string:
+        # 2) Heuristic walk over the DOM, using lxml directly (no BeautifulSoup layer).
+        if not html.strip():
+            return []
+        try:
+            # Parse the already-decoded text directly rather than re-encoding a full copy.
+            tree = lxml_html.document_fromstring(html)
+        except ValueError:
+            # lxml rejects str input carrying an XML encoding declaration.
             try:
-                data = json.loads(next_data.string)
-                # Best-effort: look for league display names.
-                text = next_data.string
-                for slug in league_slugs:
-                    # try to find "slug":"...","name":"..."
-                    # fall back to slug
-                    pass
-            except Exception:
-                pass
-
-        matches: List[Match] = []
+                tree = lxml_html.document_fromstring(html.encode("utf-8"), parser=_HTML_PARSER)
+            except etree.ParserError:
+                return []
+        except etree.ParserError:
+            return []
+
+        league_hrefs = tuple(f"/leagues/{s}" for s in league_slugs)
+        if not league_hrefs:
+            return []
+
+        # Every card-like ancestor of a link to one of our leagues, found in one libxml2
+        # query; the walk below then only needs a set lookup per ancestor.
+        has_league_link = set(
+            tree.xpath(
+                "//a[%s]/ancestor::*[%s]"
+                % (
+                    " or ".join(f"contains(@href, $h{i})" for i in range(len(league_hrefs))),
+                    " or ".join(f"self::{t}" for t in sorted(_CONTAINER_TAGS)),
+                ),
+                **{f"h{i}": h for i, h in enumerate(league_hrefs)},
+            )
+        )
+
+        # Team-marker verdict per league-link container. Sibling <time> elements share
+        # ancestors, so each container's subtree is scanned at most once per page.
+        is_card: Dict[Any, bool] = {}
+
+        # Keyed by UID so duplicates collapse as matches are produced (last one wins).
+        matches: Dict[str, Match] = {}
 
         # Find candidate match containers by presence of a <time datetime> and two team labels.
-        for time_el in soup.find_all("time"):
+        for time_el in tree.iter("time"):
             dt_raw = time_el.get("datetime") or time_el.get("dateTime")
             if not dt_raw:
                 continue
             try:
-                start_dt = datetime.fromisoformat(str(dt_raw).replace("Z", "+00:00"))
-            except Exception:
+                start_dt = parse_iso_datetime(str(dt_raw))
+            except ValueError:
                 continue
             if start_dt.tzinfo is None:
                 # treat as UTC if machine-readable but missing tz
                 start_dt = start_dt.replace(tzinfo=timezone.utc)
             start_utc = start_dt.astimezone(timezone.utc)
-            start_local = start_utc.astimezone(tz)
 
             # Walk up to a container that actually represents a match card.
             container = None
@@ -92,69 +173,73 @@ class HtmlScraper:
             for _ in range(12):
                 if cur is None:
                     break
-                if getattr(cur, "name", None) in ("article", "div", "li", "section"):
-                    # Heuristic: must contain a league link for one of our slugs.
-                    has_league_link = False
-                    for a in cur.find_all("a", href=True):
-                        href = str(a.get("href") or "")
-                        if any(f"/leagues/{s}" in href for s in league_slugs):
-                            has_league_link = True
-                            break
-                    if has_league_link:
-                        # Must also contain teams marker.
-                        if cur.select(".team") or (" vs " in cur.get_text(" ", strip=True).lower()):
-                            container = cur
-                            break
-                cur = cur.parent
+                # Heuristic: must contain a league link for one of our slugs...
+                if cur in has_league_link:
+                    # ...and also a teams marker.
+                    card = is_card.get(cur)
+                    if card is None:
+                        card = is_card[cur] = bool(
+                            _TEAM_XPATH(cur) or (" vs " in _text(cur).lower())
+                        )
+                    if card:
+                        container = cur
+                        break
+                cur = cur.getparent()
 
             if container is None:
                 continue
 
-            text = container.get_text(" ", strip=True)
+            strings = _stripped_strings(container)
+            text = " ".join(strings)
             if not text:
                 continue
 
-            # Try infer league slug + name from any /leagues/<slug> link in the container.
+            # One pass over the container's links: infer league slug + name from the first
+            # /leagues/<slug> link, and the match URL from the first match/live link.
             slug = None
             league_name = None
-            for a in container.find_all("a", href=True):
+            match_href = None
+            for a in container.iter("a"):
                 href = str(a.get("href") or "")
-                for s in league_slugs:
-                    if f"/leagues/{s}" in href:
-                        slug = s
-                        txt = a.get_text(" ", strip=True)
-                        league_name = txt or None
-                        break
-                if slug:
+                if slug is None:
+                    # First slug in the order given whose link appears anywhere in the href.
+                    for candidate, league_href in zip(league_slugs, league_hrefs):
+                        if league_href in href:
+                            slug = candidate
+                            league_name = _text(a) or None
+                            break
+                if match_href is None and (
+                    "/match/" in href or "/matches/" in href or "/live/" in href
+                ):
+                    match_href = href
+                if slug is not None and match_href is not None:
                     break
             if not slug:
                 # If we can't assign it, skip (caller needs per-league output).
                 continue
 
-            league_name = league_name or league_name_by_slug.get(slug, slug)
+            league_name = league_name or slug
 
             # Team names: prefer explicit team elements.
             team1 = "TBD"
             team2 = "TBD"
 
-            team_els = container.select(".teams .team, .team")
-            team_texts = [e.get_text(" ", strip=True) for e in team_els]
+            team_els = _TEAM_XPATH(container)
+            team_texts = [_text(e) for e in team_els]
             team_texts = [t for t in team_texts if t]
             if len(team_texts) >= 2:
                 team1, team2 = team_texts[0], team_texts[1]
             else:
-                # Fallback: pick tokens around a 'vs' marker.
-                tokens = [t for t in container.get_text("\n", strip=True).split("\n") if t]
-                vs_idx = None
-                for i, t in enumerate(tokens):
-                    if t.strip().lower() in {"vs", "v"}:
-                        vs_idx = i
+                # Fallback: pick tokens around a 'vs' marker, stopping at the first one.
+                tokens = (t for s in strings for t in s.split("\n") if t)
+                prev = None
+                for t in tokens:
+                    if t.strip().lower() in _VS_TOKENS:
+                        if prev is not None:
+                            team1 = prev.strip() or "TBD"
+                        team2 = next(tokens, "").strip() or "TBD"
                         break
-                if vs_idx is not None:
-                    if vs_idx - 1 >= 0:
-                        team1 = tokens[vs_idx - 1].strip() or "TBD"
-                    if vs_idx + 1 < len(tokens):
-                        team2 = tokens[vs_idx + 1].strip() or "TBD"
+                    prev = t
 
             # Stage / best-of (best-effort)
             stage = None
@@ -166,27 +251,19 @@ class HtmlScraper:
             elif "Bo1" in text:
                 best_of = "Bo1"
 
-            # Attempt stage from labeled chips
-            for chip in container.find_all(["span", "div"]):
-                t = chip.get_text(" ", strip=True)
-                if t and t.lower() in {
-                    "playoffs",
-                    "swiss",
-                    "groups",
-                    "group stage",
-                    "final",
-                    "semifinal",
-                    "quarterfinal",
-                }:
-                    stage = t
+            # Attempt stage from labeled chips: the first span/div whose whole text is a stage.
+            for chip in _CHIP_XPATH(container):
+                chip_text = _text(chip)
+                if chip_text and chip_text.lower() in _STAGE_NAMES:
+                    stage = chip_text
                     break
 
             match_url = page_url
-            for a in container.find_all("a", href=True):
-                href = str(a.get("href") or "")
-                if "/match/" in href or "/matches/" in href or "/live/" in href:
-                    match_url = href if href.startswith("http") else f"https://lolesports.com{href}"
-                    break
+            if match_href is not None:
+                if match_href.startswith("http"):
+                    match_url = match_href
+                else:
+                    match_url = f"https://lolesports.com{match_href}"
 
             uid = stable_uid(
                 league_slug=slug,
@@ -197,40 +274,32 @@ class HtmlScraper:
                 stage=stage,
             )
 
-            matches.append(
-                Match(
-                    league_slug=slug,
-                    league_name=league_name,
-                    match_id=None,
-                    match_start_utc=start_utc,
-                    match_start_local=start_local,
-                    best_of=best_of,
-                    team1=team1,
-                    team2=team2,
-                    team1_code=None,  # HTML fallback doesn't have codes
-                    team2_code=None,
-                    stage=stage,
-                    match_url=match_url,
-                    stable_uid=uid,
-                    state=None,
-                    team1_score=None,
-                    team2_score=None,
-                    winner=None,
-                )
+            matches[uid] = Match(
+                league_slug=slug,
+                league_name=league_name,
+                match_id=None,
+                match_start_utc=start_utc,
+                best_of=best_of,
+                team1=team1,
+                team2=team2,
+                team1_code=None,  # HTML fallback doesn't have codes
+                team2_code=None,
+                stage=stage,
+                match_url=match_url,
+                stable_uid=uid,
+                state=None,
+                team1_score=None,
+                team2_score=None,
+                winner=None,
             )
 
-        # Deduplicate by UID
-        uniq: Dict[str, Match] = {}
-        for m in matches:
-            uniq[m.stable_uid] = m
-        return list(uniq.values())
+        return list(matches.values())
 
     @staticmethod
     def _parse_from_apollo_ssr(
         html: str,
         *,
         league_slugs: List[str],
-        tz: ZoneInfo,
         page_url: str,
     ) -> List[Match]:
         """Parse server-rendered Apollo cache payload embedded in the schedule page.
@@ -240,60 +309,103 @@ class HtmlScraper:
 
         The object is almost-JSON but may contain `undefined`; we normalize and decode.
         """
-
-        payload_texts: List[str] = []
-        # Extract the argument to `.push(<here>)` from any script containing ApolloSSRDataTransport.
-        for m in re.finditer(r"ApolloSSRDataTransport[\s\S]{0,2000}?\.push\(", html):
-            start = m.end()
-            script_end = html.find("</script>", start)
-            if script_end == -1:
-                continue
-            end_paren = html.rfind(")", start, script_end)
-            if end_paren == -1:
-                continue
-            payload_texts.append(html[start:end_paren])
+        if "ApolloSSRDataTransport" not in html:
+            return []
 
         def normalize_js_object(text: str) -> str:
             # Replace bare `undefined` tokens with null (not inside quotes).
-            return re.sub(r"\bundefined\b", "null", text)
-
-        def find_event_matches(obj: Any) -> List[Dict[str, Any]]:
+            if "undefined" not in text:
+                return text
+            return _JS_STRING_OR_UNDEFINED_RE.sub(_undefined_to_null, text)
+
+        def find_event_matches(root: Any) -> List[Dict[str, Any]]:
+            # Iterative pre-order walk: no Python frame per node and no recursion limit.
+            # Children are pushed reversed so events come out in document order.
+            # Decoded JSON only yields exact dicts/lists, so `type() is` skips the MRO check.
             out: List[Dict[str, Any]] = []
-            if isinstance(obj, dict):
-                if obj.get("__typename") == "EventMatch":
-                    out.append(obj)
-                for v in obj.values():
-                    out.extend(find_event_matches(v))
-            elif isinstance(obj, list):
-                for it in obj:
-                    out.extend(find_event_matches(it))
+            stack = [root]
+            pop, push = stack.pop, stack.extend
+            while stack:
+                obj = pop()
+                kind = type(obj)
+                if kind is dict:
+                    if obj.get("__typename") == "EventMatch":
+                        out.append(obj)
+                    push(reversed(obj.values()))
+                elif kind is list:
+                    push(reversed(obj))
             return out
 
-        matches: List[Match] = []
-        for text in payload_texts:
-            try:
-                payload = json.loads(normalize_js_object(text))
-            except Exception:
+        # Decode the argument of `.push(<here>)` after every ApolloSSRDataTransport marker,
+        # in one forward scan. Each <script> body is normalized once, from its first push to
+        # its end; raw_decode then reads every pushed object in place and the scan resumes
+        # where that object ends, so a script holding many pushes stays linear in its size.
+        decoder = json.JSONDecoder()
+        payloads: List[Any] = []
+        pos = 0
+        while True:
+            marker = html.find("ApolloSSRDataTransport", pos)
+            if marker == -1:
+                break
+            script_end = html.find("</script>", marker)
+            if script_end == -1:
+                break
+            push = html.find(".push(", marker, min(script_end, marker + 2000))
+            if push == -1:
+                pos = marker + len("ApolloSSRDataTransport")
                 continue
+            pos = script_end
+            text = normalize_js_object(html[push + len(".push(") : script_end])
+            idx = 0
+            while True:
+                idx = _JSON_WS_RE.match(text, idx).end()
+                if text.find("ApolloSSRDataTransport", idx) == -1:
+                    try:
+                        # Fast path for the script's last push (orjson when installed): the
+                        # script ends with the call, so everything before the last `)` is the
+                        # object. A wrong guess cannot parse.
+                        payloads.append(json_loads(text[idx : text.rindex(")", idx)]))
+                        break
+                    except ValueError:
+                        pass
+                try:
+                    payload, end = decoder.raw_decode(text, idx)
+                    payloads.append(payload)
+                except ValueError:
+                    end = idx
+                # Move on to the next push in this script, if there is one.
+                idx = -1
+                marker = text.find("ApolloSSRDataTransport", end)
+                while marker != -1:
+                    push = text.find(".push(", marker, marker + 2000)
+                    if push != -1:
+                        idx = push + len(".push(")
+                        break
+                    marker = text.find("ApolloSSRDataTransport", marker + 1)
+                if idx == -1:
+                    break
 
+        allowed_slugs = frozenset(league_slugs)
+        # Keyed by UID so duplicates collapse as matches are produced (last one wins).
+        matches: Dict[str, Match] = {}
+        for payload in payloads:
             events = find_event_matches(payload)
             for ev in events:
                 league = ev.get("league") or {}
                 slug = league.get("slug")
-                if not slug or slug not in set(league_slugs):
+                if not slug or slug not in allowed_slugs:
                     continue
 
                 start = ev.get("startTime")
                 if not start:
                     continue
                 try:
-                    start_dt = datetime.fromisoformat(str(start).replace("Z", "+00:00"))
-                except Exception:
+                    start_dt = parse_iso_datetime(str(start))
+                except ValueError:
                     continue
                 if start_dt.tzinfo is None:
                     start_dt = start_dt.replace(tzinfo=timezone.utc)
                 start_utc = start_dt.astimezone(timezone.utc)
-                start_local = start_utc.astimezone(tz)
 
                 league_name = league.get("name") or slug
 
@@ -324,7 +436,7 @@ class HtmlScraper:
                 if cnt is not None:
                     try:
                         best_of = f"Bo{int(cnt)}"
-                    except Exception:
+                    except (TypeError, ValueError):
                         best_of = str(cnt)
 
                 # Match state and winner
@@ -359,39 +471,47 @@ class HtmlScraper:
                     stage=str(stage) if stage else None,
                 )
 
-                matches.append(
-                    Match(
-                        league_slug=str(slug),
-                        league_name=str(league_name),
-                        match_id=str(match_id) if match_id else None,
-                        match_start_utc=start_utc,
-                        match_start_local=start_local,
-                        best_of=best_of,
-                        team1=team1,
-                        team2=team2,
-                        team1_code=team1_code,
-                        team2_code=team2_code,
-                        stage=str(stage) if stage else None,
-                        match_url=match_url,
-                        stable_uid=uid,
-                        state=state,
-                        team1_score=team1_score,
-                        team2_score=team2_score,
-                        winner=winner,
-                    )
+                matches[uid] = Match(
+                    league_slug=str(slug),
+                    league_name=str(league_name),
+                    match_id=str(match_id) if match_id else None,
+                    match_start_utc=start_utc,
+                    best_of=best_of,
+                    team1=team1,
+                    team2=team2,
+                    team1_code=team1_code,
+                    team2_code=team2_code,
+                    stage=str(stage) if stage else None,
+                    match_url=match_url,
+                    stable_uid=uid,
+                    state=state,
+                    team1_score=team1_score,
+                    team2_score=team2_score,
+                    winner=winner,
                 )
 
-        uniq: Dict[str, Match] = {}
-        for m in matches:
-            uniq[m.stable_uid] = m
-        return list(uniq.values())
+        return list(matches.values())
 
     def fetch_matches(self, league_slugs: List[str], *, config: ScrapeConfig) -> List[Match]:
         page_url = f"https://lolesports.com/schedule?leagues={','.join(league_slugs)}"
         resp = self.fetcher.get(page_url)
-        return self.parse_schedule_html(
-            resp.text, league_slugs=league_slugs, tz_name=config.tz, page_url=page_url
+        # The zone doesn't affect parsed results, but is still validated on cache hits.
+        get_zone(config.tz)
+        # The schedule page is often byte-identical between runs; skip re-parsing it.
+        key = (
+            hashlib.blake2b(resp.content, digest_size=16).digest(),
+            tuple(league_slugs),
+            page_url,
         )
+        matches = _PARSE_CACHE.get(key)
+        if matches is None:
+            matches = self.parse_schedule_html(
+                resp.text, league_slugs=league_slugs, tz_name=config.tz, page_url=page_url
+            )
+            if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+                del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+            _PARSE_CACHE[key] = matches
+        return list(matches)
 
 
 def scrape_matches(
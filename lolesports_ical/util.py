@@ -1,18 +1,35 @@
 from __future__ import annotations
 
 import hashlib
+import importlib.util
 import json
-import os
 import random
 import re
+import sys
+import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Optional
+from zoneinfo import ZoneInfo
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+# Only probed, never imported: its presence lets httpx speak HTTP/2 (see the "fast" extra).
+_HAS_H2 = importlib.util.find_spec("h2") is not None
+
+try:
+    from ciso8601 import parse_datetime as _ciso_parse_datetime
+except ImportError:  # optional speedup, see the "fast" extra
+    _ciso_parse_datetime = None
+
 
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -21,6 +38,26 @@ DEFAULT_USER_AGENT = (
 )
 
 
+def json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_dumps_indented(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON with 2-space indent; identical output with or without orjson."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def sha256_hex(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
@@ -36,31 +73,57 @@ def stable_uid(
 ) -> str:
     # IMPORTANT: iOS/Calendar clients treat UID changes as new events.
     # Do not include fields that may change over time (like URLs).
-    base = "|".join(
-        [
-            league_slug,
-            (match_id or "").strip(),
-            match_start_utc_iso,
-            team1.strip(),
-            team2.strip(),
-            (stage or "").strip(),
-        ]
+    base = (
+        f"{league_slug}|{(match_id or '').strip()}|{match_start_utc_iso}|"
+        f"{team1.strip()}|{team2.strip()}|{(stage or '').strip()}"
     )
-    return f"{sha256_hex(base)[:32]}@lolesports"
+    return f"{hashlib.sha256(base.encode('utf-8')).hexdigest()[:32]}@lolesports"
 
 
 def ensure_tzaware_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is timezone.utc:
+        return dt
     if dt.tzinfo is None:
         raise ValueError("datetime must be timezone-aware")
     return dt.astimezone(timezone.utc)
 
 
+@lru_cache(maxsize=32)
+def get_zone(tz_name: str) -> ZoneInfo:
+    """Return the ZoneInfo for `tz_name`, resolved once per process."""
+    return ZoneInfo(tz_name)
+
+
+# Python 3.11+ parses a trailing `Z` natively; 3.10 needs it spelled as an offset.
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+# ciso8601 accepts more than fromisoformat (hour 24, a lowercase `z`, ...), which would make
+# the kept matches depend on the "fast" extra. It only gets this plain shape, which both
+# parse identically and which covers the feed's own timestamps.
+_CISO_SAFE_RE = re.compile(
+    r"[0-9]{4}-[0-9]{2}-[0-9]{2}T(?:[01][0-9]|2[0-3]):[0-9]{2}:[0-9]{2}(?:\.[0-9]{3}|\.[0-9]{6})?Z?"
+)
+
+
+def parse_iso_datetime(text: str) -> datetime:
+    """Parse an ISO-8601 timestamp, accepting a trailing `Z` for UTC. Raises ValueError."""
+    if _FROMISOFORMAT_ACCEPTS_Z:
+        # The C fromisoformat is faster than checking the shape for ciso8601 first.
+        return datetime.fromisoformat(text)
+    if _ciso_parse_datetime is not None and _CISO_SAFE_RE.fullmatch(text):
+        return _ciso_parse_datetime(text)
+    return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+@lru_cache(maxsize=4096)
 def isoformat_z(dt: datetime) -> str:
-    dt_utc = ensure_tzaware_utc(dt)
-    return dt_utc.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    # Feeds stable_uid, so the output must stay byte-identical: YYYY-MM-DDTHH:MM:SSZ.
+    # Many matches share a start time, hence the cache.
+    u = ensure_tzaware_utc(dt)
+    return f"{u.year:04d}-{u.month:02d}-{u.day:02d}T{u.hour:02d}:{u.minute:02d}:{u.second:02d}Z"
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryConfig:
     max_attempts: int = 5
     base_delay_s: float = 0.8
@@ -70,18 +133,19 @@ class RetryConfig:
 class RateLimiter:
     def __init__(self, min_interval_s: float = 1.0) -> None:
         self.min_interval_s = float(min_interval_s)
-        self._last_by_host: Dict[str, float] = {}
+        self._interval_ns = int(self.min_interval_s * 1e9)
+        # Earliest monotonic_ns at which the next request to each host may start.
+        self._next_ns_by_host: Dict[str, int] = {}
+        self._lock = threading.Lock()
 
     def wait(self, host: str) -> None:
-        now = time.monotonic()
-        last = self._last_by_host.get(host)
-        if last is None:
-            self._last_by_host[host] = now
-            return
-        delta = now - last
-        if delta < self.min_interval_s:
-            time.sleep(self.min_interval_s - delta)
-        self._last_by_host[host] = time.monotonic()
+        # Reserve a slot under the lock, then sleep outside it so other hosts aren't blocked.
+        with self._lock:
+            now = time.monotonic_ns()
+            next_ns = self._next_ns_by_host.get(host, now)
+            self._next_ns_by_host[host] = max(now, next_ns) + self._interval_ns
+        if next_ns > now:
+            time.sleep((next_ns - now) / 1e9)
 
 
 class DiskCache:
@@ -93,21 +157,29 @@ class DiskCache:
     def _path_for_key(self, key: str) -> Path:
         return self.cache_dir / f"{key}.json"
 
+    def _body_path_for_key(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.bin"
+
     def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry's metadata with its raw bytes under "body", or None."""
         path = self._path_for_key(key)
         if not path.exists():
             return None
         try:
-            payload = json.loads(path.read_text(encoding="utf-8"))
+            payload = json_loads(path.read_bytes())
         except Exception:
             return None
-        if payload.get("v") != 2:
+        if payload.get("v") != 3:
             return None
         ts = payload.get("ts")
         if not isinstance(ts, (int, float)):
             return None
         if (time.time() - float(ts)) > self.ttl_s:
             return None
+        try:
+            payload["body"] = self._body_path_for_key(key).read_bytes()
+        except OSError:
+            return None
         return payload
 
     def set(self, key: str, *, status: int, headers: Dict[str, str], body: bytes) -> None:
@@ -118,13 +190,51 @@ class DiskCache:
         for h in ("content-encoding", "transfer-encoding", "content-length"):
             headers_clean.pop(h, None)
         payload = {
-            "v": 2,
+            "v": 3,
             "ts": time.time(),
             "status": status,
             "headers": headers_clean,
-            "body_b64": body.decode("latin1"),
         }
-        path.write_text(json.dumps(payload), encoding="utf-8")
+        # The body is stored verbatim next to the metadata; written first so a
+        # readable metadata file always has its body.
+        self._body_path_for_key(key).write_bytes(body)
+        path.write_bytes(json_dumps(payload))
+
+
+class CachedResponse:
+    """The subset of `httpx.Response` callers use, served from the disk cache.
+
+    Cheaper than building an `httpx.Response` + `httpx.Request` on every cache hit.
+    Only successful responses are cached, so `raise_for_status` never raises.
+    """
+
+    __slots__ = ("status_code", "headers", "content", "_text")
+
+    def __init__(self, *, status_code: int, headers: Dict[str, str], content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers  # lower-cased names, as stored by DiskCache.set
+        self.content = content
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            encoding = "utf-8"
+            for param in self.headers.get("content-type", "").split(";")[1:]:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "charset" and value.strip(" \"'"):
+                    encoding = value.strip(" \"'")
+            try:
+                self._text = self.content.decode(encoding, errors="replace")
+            except LookupError:
+                self._text = self.content.decode("utf-8", errors="replace")
+        return self._text
+
+    def json(self) -> Any:
+        return json_loads(self.content)
+
+    def raise_for_status(self) -> None:
+        return None
 
 
 class Fetcher:
@@ -141,7 +251,13 @@ class Fetcher:
         self.rate_limiter = rate_limiter
         self.retry = retry or RetryConfig()
         self.client = httpx.Client(
-            timeout=timeout_s, headers={"User-Agent": user_agent}, follow_redirects=True
+            timeout=timeout_s,
+            headers={"User-Agent": user_agent},
+            follow_redirects=True,
+            # Keep connections alive across rate-limit pauses so repeat requests skip the
+            # TLS handshake; with h2 installed they are also multiplexed over HTTP/2.
+            http2=_HAS_H2,
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0),
         )
 
     def close(self) -> None:
@@ -150,13 +266,15 @@ class Fetcher:
     def _cache_key(
         self, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]]
     ) -> str:
-        params_items: Iterable[Tuple[str, Any]] = sorted((params or {}).items())
-        headers_items: Iterable[Tuple[str, str]] = sorted((headers or {}).items())
-        raw = json.dumps(
-            {"url": url, "params": list(params_items), "headers": list(headers_items)},
-            sort_keys=True,
-        )
-        return sha256_hex(raw)
+        # Fed straight into the hash; control-character separators keep the parts apart.
+        h = hashlib.blake2b(url.encode("utf-8"), digest_size=16)
+        if params:
+            for k, v in sorted(params.items()):
+                h.update(f"\x1f{k}={v}".encode("utf-8"))
+        if headers:
+            for k, v in sorted(headers.items()):
+                h.update(f"\x1e{k}={v}".encode("utf-8"))
+        return h.hexdigest()
 
     def get(
         self,
@@ -164,21 +282,17 @@ class Fetcher:
         *,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
-    ) -> httpx.Response:
-        host = httpx.URL(url).host or ""
+    ) -> httpx.Response | CachedResponse:
         key = self._cache_key(url, params, headers)
         cached = self.cache.get(key)
         if cached is not None:
-            status = int(cached.get("status", 200))
-            body = str(cached.get("body_b64", "")).encode("latin1")
-            resp_headers = {str(k): str(v) for k, v in (cached.get("headers") or {}).items()}
-            return httpx.Response(
-                status_code=status,
-                headers=resp_headers,
-                content=body,
-                request=httpx.Request("GET", url),
+            return CachedResponse(
+                status_code=int(cached.get("status", 200)),
+                headers={str(k): str(v) for k, v in (cached.get("headers") or {}).items()},
+                content=cached["body"],
             )
 
+        host = httpx.URL(url).host or ""
         attempt = 0
         while True:
             attempt += 1
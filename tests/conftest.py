@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from lolesports_ical.util import get_zone
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture(scope="session")
+def schedule_html() -> Dict[str, str]:
+    """Schedule page fixtures by name, read once per test session."""
+    return {
+        "default": (FIXTURES_DIR / "schedule_fixture.html").read_text(encoding="utf-8"),
+        "apollo": (FIXTURES_DIR / "schedule_apollo_fixture.html").read_text(encoding="utf-8"),
+    }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_zone_cache() -> None:
+    """Load tzdata before any test runs, so `--durations` doesn't charge it to the first one.
+
+    Module-level regexes are compiled at import time and need no warm-up.
+    """
+    get_zone("Europe/Berlin")
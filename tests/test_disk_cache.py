@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from lolesports_ical.util import DiskCache, Fetcher, RateLimiter
+
+
+def test_disk_cache_round_trips_raw_body(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, ttl_s=60)
+    body = bytes(range(256)) * 4
+
+    cache.set(
+        "k",
+        status=200,
+        headers={"content-type": "text/html", "content-encoding": "gzip"},
+        body=body,
+    )
+
+    entry = cache.get("k")
+    assert entry is not None
+    assert entry["status"] == 200
+    assert entry["headers"] == {"content-type": "text/html"}
+    assert entry["body"] == body
+    assert (tmp_path / "k.bin").read_bytes() == body
+
+
+def test_disk_cache_misses_without_body_file(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, ttl_s=60)
+    cache.set("k", status=200, headers={}, body=b"<html></html>")
+    (tmp_path / "k.bin").unlink()
+
+    assert cache.get("k") is None
+
+
+def test_fetcher_serves_cache_hits_without_network(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, ttl_s=60)
+    fetcher = Fetcher(cache=cache, rate_limiter=RateLimiter(0.0))
+    url = "https://lolesports.com/schedule?leagues=lec"
+    body = "Köln vs Zürich".encode("latin-1")
+    cache.set(
+        fetcher._cache_key(url, None, None),
+        status=200,
+        headers={"content-type": "text/html; charset=ISO-8859-1"},
+        body=body,
+    )
+    fetcher.client.close()  # any real request would now fail
+
+    resp = fetcher.get(url)
+
+    assert resp.status_code == 200
+    assert resp.content == body
+    assert resp.text == "Köln vs Zürich"
+    resp.raise_for_status()
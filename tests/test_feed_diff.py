@@ -6,9 +6,12 @@ since DTSTAMP changes on every generation but doesn't represent actual data chan
 
 from __future__ import annotations
 
+import dataclasses
 import re
 from datetime import datetime, timezone
 
+import pytest
+
 from lolesports_ical.ical import render_ical
 from lolesports_ical.models import Match
 
@@ -20,8 +23,21 @@ def normalize_feed_for_comparison(feed: str) -> str:
     This mirrors the workflow logic:
     grep -v '^DTSTAMP:' feed.ics
     """
-    lines = feed.splitlines()
-    return "\n".join(line for line in lines if not line.startswith("DTSTAMP:"))
+    # Copy the spans between DTSTAMP lines, located with str.find (no per-line objects).
+    pieces = []
+    start = 0
+    if feed.startswith("DTSTAMP:"):
+        start = feed.find("\n") + 1 or len(feed)
+    while True:
+        stamp = feed.find("\nDTSTAMP:", start)
+        if stamp < 0:
+            pieces.append(feed[start:])
+            return "".join(pieces)
+        pieces.append(feed[start : stamp + 1])
+        start = feed.find("\n", stamp + 1) + 1 or len(feed)
+
+
+_START_UTC = datetime(2026, 1, 15, 18, 0, tzinfo=timezone.utc)
 
 
 def create_test_match(
@@ -34,17 +50,11 @@ def create_test_match(
     winner: str | None = None,
 ) -> Match:
     """Create a test match with sensible defaults."""
-    from zoneinfo import ZoneInfo
-    
-    start_utc = datetime(2026, 1, 15, 18, 0, tzinfo=timezone.utc)
-    start_local = start_utc.astimezone(ZoneInfo("Europe/Berlin"))
-    
     return Match(
         league_slug="lec",
         league_name="LEC",
         match_id=match_id,
-        match_start_utc=start_utc,
-        match_start_local=start_local,
+        match_start_utc=_START_UTC,
         best_of="Bo3",
         team1=team1,
         team2=team2,
@@ -60,105 +70,94 @@ def create_test_match(
     )
 
 
-def test_dtstamp_is_present_in_feed() -> None:
-    """Verify that DTSTAMP is actually included in generated feeds."""
-    match = create_test_match()
-    feed = render_ical([match])
-    assert "DTSTAMP:" in feed
-
-
-def test_dtstamp_stripped_in_normalization() -> None:
-    """Verify that normalization removes DTSTAMP lines."""
-    match = create_test_match()
-    feed = render_ical([match])
-    normalized = normalize_feed_for_comparison(feed)
-    assert "DTSTAMP:" not in normalized
-
-
-def test_identical_matches_produce_equal_normalized_feeds() -> None:
-    """Two feeds with the same match data should be equal after normalization."""
-    match = create_test_match()
-    
-    # Generate two feeds (DTSTAMP will differ if there's any time gap)
-    feed1 = render_ical([match])
-    feed2 = render_ical([match])
-    
-    # Normalize both
-    normalized1 = normalize_feed_for_comparison(feed1)
-    normalized2 = normalize_feed_for_comparison(feed2)
-    
-    assert normalized1 == normalized2
-
-
-def test_different_scores_produce_different_normalized_feeds() -> None:
-    """When match scores change, normalized feeds should differ."""
-    match_unfinished = create_test_match(state="unstarted")
-    match_finished = create_test_match(
-        state="completed",
-        team1_score=2,
-        team2_score=1,
-        winner="Team A",
-    )
-    
-    feed1 = render_ical([match_unfinished])
-    feed2 = render_ical([match_finished])
-    
-    normalized1 = normalize_feed_for_comparison(feed1)
-    normalized2 = normalize_feed_for_comparison(feed2)
-    
-    assert normalized1 != normalized2
-
-
-def test_new_match_produces_different_normalized_feed() -> None:
-    """Adding a new match should produce a different normalized feed."""
-    match1 = create_test_match(match_id="123")
-    match2 = create_test_match(match_id="456", team1="Team C", team2="Team D")
-    
-    feed_one_match = render_ical([match1])
-    feed_two_matches = render_ical([match1, match2])
-    
-    normalized1 = normalize_feed_for_comparison(feed_one_match)
-    normalized2 = normalize_feed_for_comparison(feed_two_matches)
-    
-    assert normalized1 != normalized2
-
-
-def test_match_time_change_produces_different_normalized_feed() -> None:
-    """Rescheduled match should produce a different normalized feed."""
-    from zoneinfo import ZoneInfo
-    
-    match1 = create_test_match()
-    
-    start_utc = datetime(2026, 1, 16, 18, 0, tzinfo=timezone.utc)  # Different day
-    start_local = start_utc.astimezone(ZoneInfo("Europe/Berlin"))
-    
-    match2 = Match(
-        league_slug="lec",
-        league_name="LEC",
-        match_id="123",
-        match_start_utc=start_utc,
-        match_start_local=start_local,
-        best_of="Bo3",
-        team1="Team A",
-        team2="Team B",
-        team1_code="TA",
-        team2_code="TB",
-        stage="Playoffs",
-        match_url="https://lolesports.com/live/lec/123",
-        stable_uid="test-uid-123@lolesports",
-        state="unstarted",
-        team1_score=None,
-        team2_score=None,
-        winner=None,
-    )
-    
-    feed1 = render_ical([match1])
-    feed2 = render_ical([match2])
-    
-    normalized1 = normalize_feed_for_comparison(feed1)
-    normalized2 = normalize_feed_for_comparison(feed2)
-    
-    assert normalized1 != normalized2
+@pytest.fixture(scope="module")
+def default_feed() -> str:
+    """The feed for the default test match, rendered once for this module."""
+    return render_ical([create_test_match()])
+
+
+# Property names at the start of a line; one scan collects every name in a feed.
+_PROPERTY_RE = re.compile(
+    r"^(DTSTAMP|UID|DTSTART|DTEND|SUMMARY|DESCRIPTION|URL|BEGIN|END):", re.MULTILINE
+)
+
+
+def test_normalization_strips_only_dtstamp(default_feed: str) -> None:
+    """DTSTAMP is present in generated feeds, and normalization removes only it."""
+    before = set(_PROPERTY_RE.findall(default_feed))
+    after = set(_PROPERTY_RE.findall(normalize_feed_for_comparison(default_feed)))
+
+    assert "DTSTAMP" in before
+    assert before - after == {"DTSTAMP"}
+
+
+@pytest.mark.parametrize(
+    ("matches", "expect_equal"),
+    [
+        # Same match data: equal after normalization, even though DTSTAMP moved on.
+        pytest.param([create_test_match()], True, id="identical"),
+        # Match finished and got scores.
+        pytest.param(
+            [
+                create_test_match(
+                    state="completed",
+                    team1_score=2,
+                    team2_score=1,
+                    winner="Team A",
+                )
+            ],
+            False,
+            id="scores-changed",
+        ),
+        # Another match was added.
+        pytest.param(
+            [
+                create_test_match(match_id="123"),
+                create_test_match(match_id="456", team1="Team C", team2="Team D"),
+            ],
+            False,
+            id="new-match",
+        ),
+        # Match went live.
+        pytest.param([create_test_match(state="inProgress")], False, id="went-live"),
+        # A TBD slot was filled with a different team.
+        pytest.param([create_test_match(team2="Team C")], False, id="team-changed"),
+        # Match was rescheduled to a different day.
+        pytest.param(
+            [
+                dataclasses.replace(
+                    create_test_match(),
+                    match_start_utc=datetime(2026, 1, 16, 18, 0, tzinfo=timezone.utc),
+                )
+            ],
+            False,
+            id="time-changed",
+        ),
+    ],
+)
+def test_normalized_feed_differs_only_on_data_changes(
+    default_feed: str, matches: list[Match], expect_equal: bool
+) -> None:
+    """Compared with the default match's feed, only real data changes show up."""
+    normalized_default = normalize_feed_for_comparison(default_feed)
+    normalized = normalize_feed_for_comparison(render_ical(matches))
+
+    assert (normalized == normalized_default) is expect_equal
+
+
+# Line-anchored markers every rendered (non-empty) feed must keep after normalization.
+_REQUIRED_TOKENS = (
+    b"BEGIN:VCALENDAR\r\n",
+    b"\r\nEND:VCALENDAR\r\n",
+    b"\r\nBEGIN:VEVENT\r\n",
+    b"\r\nEND:VEVENT\r\n",
+    b"\r\nUID:",
+    b"\r\nDTSTART:",
+    b"\r\nDTEND:",
+    b"\r\nSUMMARY:",
+    b"\r\nDESCRIPTION:",
+    b"\r\nURL:",
+)
 
 
 def test_normalization_preserves_all_other_fields() -> None:
@@ -172,24 +171,22 @@ def test_normalization_preserves_all_other_fields() -> None:
     feed = render_ical([match])
     normalized = normalize_feed_for_comparison(feed)
     
-    # These should all be preserved
-    assert "BEGIN:VCALENDAR" in normalized
-    assert "END:VCALENDAR" in normalized
-    assert "BEGIN:VEVENT" in normalized
-    assert "END:VEVENT" in normalized
-    assert "UID:" in normalized
-    assert "DTSTART:" in normalized
-    assert "DTEND:" in normalized
-    assert "SUMMARY:" in normalized
-    assert "DESCRIPTION:" in normalized
-    assert "URL:" in normalized
-
-
-def test_empty_feed_normalization() -> None:
+    # These should all be preserved; report every missing one at once
+    feed_bytes = normalized.encode("utf-8")
+    missing = [token for token in _REQUIRED_TOKENS if token not in feed_bytes]
+    assert not missing
+
+
+@pytest.fixture(scope="module")
+def empty_feed() -> str:
+    """The feed for an empty match list, rendered once for this module."""
+    return render_ical([])
+
+
+def test_empty_feed_normalization(empty_feed: str) -> None:
     """Empty match list should produce a valid calendar that normalizes correctly."""
-    feed = render_ical([])
-    normalized = normalize_feed_for_comparison(feed)
+    feed_bytes = normalize_feed_for_comparison(empty_feed).encode("utf-8")
     
-    assert "BEGIN:VCALENDAR" in normalized
-    assert "END:VCALENDAR" in normalized
-    assert "BEGIN:VEVENT" not in normalized
+    assert b"BEGIN:VCALENDAR" in feed_bytes
+    assert b"END:VCALENDAR" in feed_bytes
+    assert b"BEGIN:VEVENT" not in feed_bytes
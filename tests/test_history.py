@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from lolesports_ical import main as main_module
+from lolesports_ical.main import (
+    dict_to_match,
+    load_history_index,
+    match_to_dict,
+    merge_with_history,
+)
+from lolesports_ical.models import Match
+
+
+def make_match(match_id: str, *, day: int = 15, uid: str | None = None) -> Match:
+    start_utc = datetime(2026, 1, day, 18, 0, tzinfo=timezone.utc)
+    return Match(
+        league_slug="lec",
+        league_name="LEC",
+        match_id=match_id,
+        match_start_utc=start_utc,
+        best_of="Bo3",
+        team1="Team A",
+        team2="Team B",
+        team1_code="TA",
+        team2_code="TB",
+        stage="Playoffs",
+        match_url=f"https://lolesports.com/live/lec/{match_id}",
+        stable_uid=uid or f"fresh-{match_id}@lolesports",
+    )
+
+
+def test_merge_keeps_history_and_previous_uid(tmp_path: Path) -> None:
+    history_path = tmp_path / "history.json"
+    merge_with_history(
+        [make_match("1", day=10, uid="old-1@lolesports"), make_match("2", day=11)],
+        history_path,
+    )
+
+    merged = merge_with_history([make_match("1", day=10)], history_path)
+
+    by_id = {m.match_id: m for m in merged}
+    assert set(by_id) == {"1", "2"}
+    assert by_id["1"].stable_uid == "old-1@lolesports"
+    assert by_id["2"].stable_uid == "fresh-2@lolesports"
+
+    saved = json.loads(history_path.read_text(encoding="utf-8"))["matches"]
+    assert [d["match_id"] for d in saved] == ["1", "2"]
+
+
+def test_merge_starts_fresh_on_corrupt_history(tmp_path: Path) -> None:
+    history_path = tmp_path / "history.json"
+    history_path.write_text("{not json", encoding="utf-8")
+
+    merged = merge_with_history([make_match("1")], history_path)
+
+    assert [m.match_id for m in merged] == ["1"]
+    assert json.loads(history_path.read_text(encoding="utf-8"))["matches"][0]["match_id"] == "1"
+
+
+def test_dict_round_trip_prefers_epoch_timestamp() -> None:
+    m = make_match("7")
+    d = match_to_dict(m)
+    assert d["match_start_utc_ts"] == int(m.match_start_utc.timestamp())
+
+    assert dict_to_match(d).match_start_utc == m.match_start_utc
+
+    legacy = dict(d)
+    del legacy["match_start_utc_ts"]
+    assert dict_to_match(legacy).match_start_utc == m.match_start_utc
+
+    precise = dataclasses.replace(
+        m, match_start_utc=m.match_start_utc.replace(second=0, microsecond=123000)
+    )
+    assert dict_to_match(match_to_dict(precise)).match_start_utc == precise.match_start_utc
+
+
+def test_unchanged_history_file_is_not_reparsed(tmp_path: Path, monkeypatch) -> None:
+    history_path = tmp_path / "history.json"
+    merge_with_history([make_match("1", day=10), make_match("2", day=11)], history_path)
+
+    calls = []
+    real_loads = main_module.json_loads
+    monkeypatch.setattr(main_module, "json_loads", lambda data: calls.append(1) or real_loads(data))
+
+    # Writing the history drops its cached index, so the first load parses the file.
+    index = load_history_index(history_path)
+    assert len(index) == 2
+    assert load_history_index(history_path) is index
+    assert calls == [1]
+
+    history_path.write_text(json.dumps({"matches": []}), encoding="utf-8")
+    merged = merge_with_history([make_match("3", day=12)], history_path)
+    assert [m.match_id for m in merged] == ["3"]
+    assert calls == [1, 1]
@@ -1,21 +1,36 @@
 from __future__ import annotations
 
-from pathlib import Path
+from typing import Dict
 
-from lolesports_ical.scrape import HtmlScraper
+import pytest
 
+from lolesports_ical import scrape as scrape_module
+from lolesports_ical.models import Match
+from lolesports_ical.scrape import HtmlScraper, ScrapeConfig
 
-def test_parse_schedule_html_fixture() -> None:
-    html = Path(__file__).parent / "fixtures" / "schedule_fixture.html"
-    text = html.read_text(encoding="utf-8")
 
-    matches = HtmlScraper.parse_schedule_html(
-        text,
-        league_slugs=["lec"],
+def _parse(html: str, league_slugs: tuple[str, ...] = ("lec",)) -> list[Match]:
+    return HtmlScraper.parse_schedule_html(
+        html,
+        league_slugs=list(league_slugs),
         tz_name="Europe/Berlin",
         page_url="https://lolesports.com/schedule?leagues=lec",
     )
 
+
+def _apollo_push(event_id: str, team: str, extra: str = "") -> str:
+    """One Apollo SSR `.push(...)` statement carrying a single LEC event."""
+    payload = (
+        '{"events": [{"__typename": "EventMatch", "id": "%s", '
+        '"startTime": "2026-01-17T16:00:00Z", "league": {"slug": "lec", "name": "LEC"}, '
+        '"matchTeams": [{"name": "%s"}, {"name": "Other"}]%s}]}'
+    ) % (event_id, team, extra)
+    return f'(window[Symbol.for("ApolloSSRDataTransport")] ??= []).push({payload});'
+
+
+def test_parse_schedule_html_fixture(schedule_html: Dict[str, str]) -> None:
+    matches = _parse(schedule_html["default"])
+
     assert len(matches) == 1
     m = matches[0]
     assert m.league_slug == "lec"
@@ -27,16 +42,8 @@ def test_parse_schedule_html_fixture() -> None:
     assert m.stable_uid.endswith("@lolesports")
 
 
-def test_parse_schedule_html_apollo_fixture() -> None:
-    html = Path(__file__).parent / "fixtures" / "schedule_apollo_fixture.html"
-    text = html.read_text(encoding="utf-8")
-
-    matches = HtmlScraper.parse_schedule_html(
-        text,
-        league_slugs=["lec"],
-        tz_name="Europe/Berlin",
-        page_url="https://lolesports.com/schedule?leagues=lec",
-    )
+def test_parse_schedule_html_apollo_fixture(schedule_html: Dict[str, str]) -> None:
+    matches = _parse(schedule_html["apollo"])
 
     assert len(matches) == 1
     m = matches[0]
@@ -45,3 +52,142 @@ def test_parse_schedule_html_apollo_fixture() -> None:
     assert m.best_of == "Bo3"
     assert m.team1 == "Team One"
     assert m.team2 == "Team Two"
+
+
+def test_parse_schedule_html_multiple_apollo_payloads() -> None:
+    def script(event_id: str, team: str) -> str:
+        push = _apollo_push(event_id, team, extra=', "extra": undefined')
+        return f"<script>{push}console.log(1)</script>"
+
+    matches = _parse(
+        f"<html><body>{script('e1', 'Alpha')}<p>x</p>{script('e2', 'Beta')}</body></html>"
+    )
+
+    assert sorted(m.team1 for m in matches) == ["Alpha", "Beta"]
+    assert {m.match_id for m in matches} == {"e1", "e2"}
+
+
+def _card_page(chips: str) -> str:
+    return (
+        '<html><body><div class="match-card"><a href="/en-US/leagues/lec">LEC</a>'
+        f'{chips}<time datetime="2026-01-12T18:00:00Z">18:00</time>'
+        '<span class="team">Alpha</span><span class="team">Beta</span>'
+        "</div></body></html>"
+    )
+
+
+@pytest.mark.parametrize(
+    ("chips", "stage"),
+    [
+        ("<span>Group <b>Stage</b></span>", "Group Stage"),
+        ("<div><span>PLAYOFFS</span></div>", "PLAYOFFS"),
+        # Padding and script text do not count against the chip length limit.
+        ("<span>&nbsp;&nbsp;&nbsp;Quarterfinal&nbsp;&nbsp;&nbsp;</span>", "Quarterfinal"),
+        ("<span>Final<script>var long_name = 1;</script></span>", "Final"),
+        # Only span/div chips count, not other elements naming a stage.
+        ('<a href="/x">Final</a><p>Playoffs</p>', None),
+        ("<span>Playoffs Week 2</span>", None),
+    ],
+)
+def test_parse_schedule_html_stage_from_chips(chips: str, stage: str | None) -> None:
+    matches = _parse(_card_page(chips))
+
+    assert [m.stage for m in matches] == [stage]
+
+
+def test_parse_schedule_html_slug_follows_given_order() -> None:
+    # Both leagues appear in the href; the caller's order decides, not position in the href.
+    html = _card_page("").replace("/en-US/leagues/lec", "/leagues/lec?x=/leagues/lck")
+
+    assert [m.league_slug for m in _parse(html, league_slugs=("lck", "lec"))] == ["lck"]
+    assert [m.league_slug for m in _parse(html, league_slugs=("lec", "lck"))] == ["lec"]
+
+
+def test_parse_schedule_html_ignores_script_and_style_text() -> None:
+    html = (
+        '<html><body><div class="match-card"><a href="/en-US/leagues/lec">LEC</a>'
+        '<time datetime="2026-01-12T18:00:00Z">18:00</time>'
+        "<span>Alpha</span><script>var a=1</script><span>vs</span><span>Beta</span>"
+        "<style>.x{}</style></div></body></html>"
+    )
+
+    matches = _parse(html)
+
+    assert [(m.team1, m.team2) for m in matches] == [("Alpha", "Beta")]
+
+
+def test_parse_schedule_html_keeps_undefined_inside_strings() -> None:
+    payload = (
+        '{"events": [{"__typename": "EventMatch", "id": "e1", '
+        '"startTime": "2026-01-17T16:00:00Z", "extra": undefined, '
+        '"league": {"slug": "lec", "name": "LEC"}, "blockName": "Week \\"undefined\\" 2", '
+        '"matchTeams": [{"name": "Team undefined"}, {"name": "Other"}]}]}'
+    )
+    html = (
+        '<html><body><script>(window[Symbol.for("ApolloSSRDataTransport")] ??= [])'
+        f".push({payload});</script></body></html>"
+    )
+
+    matches = _parse(html)
+
+    assert [m.team1 for m in matches] == ["Team undefined"]
+    assert matches[0].stage == 'Week "undefined" 2'
+
+
+def test_parse_schedule_html_multiple_pushes_in_one_script() -> None:
+    pushes = _apollo_push("e1", "Alpha") + _apollo_push("e2", "Beta")
+
+    matches = _parse(f"<html><body><script>{pushes}</script></body></html>")
+
+    assert sorted(m.team1 for m in matches) == ["Alpha", "Beta"]
+
+
+def test_parse_schedule_html_many_pushes_in_one_script() -> None:
+    # Pushes separated by whitespace and `undefined`, with the last one followed by other code.
+    pushes = "\n".join(
+        _apollo_push(f"e{i}", f"Team {i}", extra=', "extra": undefined') for i in range(300)
+    )
+
+    matches = _parse(f"<html><body><script>{pushes}\nconsole.log(1)</script></body></html>")
+
+    assert sorted(m.match_id for m in matches) == sorted(f"e{i}" for i in range(300))
+
+
+def test_parse_schedule_html_with_xml_declaration(schedule_html: Dict[str, str]) -> None:
+    text = '<?xml version="1.0" encoding="utf-8"?>\n' + schedule_html["default"]
+
+    matches = _parse(text)
+
+    assert [(m.team1, m.team2) for m in matches] == [("G2 Esports", "Fnatic")]
+
+    # A declaration with no document behind it is an empty page, not an error.
+    assert _parse('<?xml version="1.0" encoding="utf-8"?>') == []
+
+
+def test_fetch_matches_reuses_parse_for_identical_page(
+    schedule_html: Dict[str, str], monkeypatch
+) -> None:
+    class _Resp:
+        text = schedule_html["apollo"]
+        content = text.encode("utf-8")
+
+    class _Fetcher:
+        def get(self, url: str) -> _Resp:
+            return _Resp()
+
+    calls = []
+    real_parse = HtmlScraper.parse_schedule_html
+    monkeypatch.setattr(
+        HtmlScraper,
+        "parse_schedule_html",
+        staticmethod(lambda *a, **kw: calls.append(1) or real_parse(*a, **kw)),
+    )
+    monkeypatch.setattr(scrape_module, "_PARSE_CACHE", {})
+
+    scraper = HtmlScraper(_Fetcher())
+    first = scraper.fetch_matches(["lec"], config=ScrapeConfig())
+    second = scraper.fetch_matches(["lec"], config=ScrapeConfig())
+
+    assert first == second
+    assert first
+    assert calls == [1]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from lolesports_ical.ical import _fold_ics_line, _ics_escape
+
+
+def test_ics_escape_special_characters() -> None:
+    assert _ics_escape("a\\b;c,d\ne") == "a\\\\b\\;c\\,d\\ne"
+    assert _ics_escape("G2 Esports") == "G2 Esports"
+
+
+def test_fold_ics_line_short_ascii_unchanged() -> None:
+    line = "SUMMARY:[LEC] G2 vs FNC"
+    assert _fold_ics_line(line) == line
+
+
+def test_fold_ics_line_counts_octets_and_keeps_code_points() -> None:
+    line = "DESCRIPTION:" + "é" * 60
+    folded = _fold_ics_line(line)
+    parts = folded.split("\r\n")
+    assert len(parts) > 1
+    assert all(len(p.encode("utf-8")) <= 75 for p in parts)
+    assert all(p.startswith(" ") for p in parts[1:])
+    assert "".join(p[1:] if i else p for i, p in enumerate(parts)) == line
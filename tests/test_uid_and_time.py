@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import dataclasses
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
-from lolesports_ical.util import isoformat_z, stable_uid
+import pytest
+
+from lolesports_ical import util
+from lolesports_ical.models import Match
+from lolesports_ical.util import isoformat_z, parse_iso_datetime, stable_uid
+
+
+_BERLIN = ZoneInfo("Europe/Berlin")
+
+# Pinned: subscribers' calendars key events on this value, so it must never drift.
+_EXPECTED_UID = "baa3384879d01a5df7a8979f378a1216@lolesports"
 
 
 def test_uid_stable() -> None:
@@ -16,23 +27,72 @@ def test_uid_stable() -> None:
         team2="Team B",
         stage="Playoffs",
     )
-    uid2 = stable_uid(
-        league_slug="lec",
-        match_id="123",
-        match_start_utc_iso=isoformat_z(dt),
-        team1="Team A",
-        team2="Team B",
-        stage="Playoffs",
-    )
-    assert uid1 == uid2
+    assert uid1 == _EXPECTED_UID
     assert uid1.endswith("@lolesports")
-    assert len(uid1.split("@")[0]) == 32
+    assert uid1.index("@") == 32
 
 
 def test_timezone_conversion_berlin() -> None:
     utc_dt = datetime(2026, 1, 12, 18, 0, tzinfo=timezone.utc)
-    berlin = ZoneInfo("Europe/Berlin")
-    local = utc_dt.astimezone(berlin)
+    local = utc_dt.astimezone(_BERLIN)
     assert local.tzinfo is not None
     # In winter, Berlin is UTC+1
     assert local.hour == 19
+
+
+def _parse_or_error(text: str) -> datetime | None:
+    try:
+        return parse_iso_datetime(text)
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "2026-01-12T18:00:00Z",
+        "2026-01-12T18:00:00.123Z",
+        "2026-01-12T18:00:00.123456Z",
+        "2026-01-12T18:00:00",
+        "2026-01-12T18:00:00+01:00",
+        "2026-02-30T18:00:00Z",
+        # ciso8601 alone accepts these two; every path must reject them.
+        "2026-01-12T24:00:00Z",
+        "2026-01-12T18:00:00z",
+    ],
+)
+def test_parse_iso_datetime_is_the_same_on_every_path(text: str, monkeypatch) -> None:
+    expected = _parse_or_error(text)
+    # The pre-3.11 paths: ciso8601 when installed, then the stdlib with `Z` spelled out.
+    monkeypatch.setattr(util, "_FROMISOFORMAT_ACCEPTS_Z", False)
+    with_ciso = _parse_or_error(text)
+    monkeypatch.setattr(util, "_ciso_parse_datetime", None)
+    without_ciso = _parse_or_error(text)
+
+    assert with_ciso == without_ciso == expected
+    if expected is not None:
+        assert with_ciso.utcoffset() == without_ciso.utcoffset() == expected.utcoffset()
+
+
+# A module-level prototype match (Match is frozen, so sharing it is safe).
+_SUMMER_MATCH = Match(
+    league_slug="lec",
+    league_name="LEC",
+    match_id="1",
+    match_start_utc=datetime(2026, 7, 12, 18, 0, tzinfo=timezone.utc),
+    best_of="Bo1",
+    team1="Team A",
+    team2="Team B",
+    team1_code=None,
+    team2_code=None,
+    stage=None,
+    match_url="https://lolesports.com/live/lec/1",
+    stable_uid="x@lolesports",
+)
+
+
+def test_match_is_slotted_and_frozen() -> None:
+    # Slotted: no per-instance __dict__ for the many matches kept in history.
+    assert not hasattr(_SUMMER_MATCH, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        _SUMMER_MATCH.team1 = "Team C"  # type: ignore[misc]